@@ -2,6 +2,8 @@
 # password_checker.py
 # Evaluates password strength based on security requirements
 
+SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
 def check_password_strength(password):
     """
     Evaluates password strength.
@@ -19,30 +21,51 @@ def check_password_strength(password):
     else:
         requirements.append("✗ At least 8 characters")
 
+    # Scan the password once for all character classes, stopping early
+    # once every class has been seen
+    has_lower = has_upper = has_digit = has_special = False
+    for c in password:
+        if "a" <= c <= "z":
+            has_lower = True
+        elif "A" <= c <= "Z":
+            has_upper = True
+        elif "0" <= c <= "9":
+            has_digit = True
+        elif c in SPECIAL_CHARS:
+            has_special = True
+        elif c.islower():
+            has_lower = True
+        elif c.isupper():
+            has_upper = True
+        elif c.isdigit():
+            has_digit = True
+
+        if has_lower and has_upper and has_digit and has_special:
+            break
+
     # Requirement 2: Lowercase letter
-    if any(c.islower() for c in password):
+    if has_lower:
         requirements_met += 1
         requirements.append("✓ Contains lowercase letters")
     else:
         requirements.append("✗ Contains lowercase letters")
 
     # Requirement 3: Uppercase letter
-    if any(c.isupper() for c in password):
+    if has_upper:
         requirements_met += 1
         requirements.append("✓ Contains uppercase letters")
     else:
         requirements.append("✗ Contains uppercase letters")
 
     # Requirement 4: Number
-    if any(c.isdigit() for c in password):
+    if has_digit:
         requirements_met += 1
         requirements.append("✓ Contains numbers")
     else:
         requirements.append("✗ Contains numbers")
 
     # Requirement 5: Special character
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if any(c in special_chars for c in password):
+    if has_special:
         requirements_met += 1
         requirements.append("✓ Contains special characters")
     else:
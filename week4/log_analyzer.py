@@ -3,10 +3,30 @@
 # Analyzes firewall logs and generates JSON reports
 
 import json
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import sys
 import os
+import re
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One compiled match pulls every field we need out of a typical line:
+# "DATE TIME ACTION SRC_IP DEST_IP PORT". Lines it rejects fall back to
+# split()/int(), so it only has to cover the common case.
+LINE_RE = re.compile(
+    rb'\s*(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s+\S+\s+(\d+)(?!\S)'
+)
+
+# Read buffer for streaming large log files
+READ_BUFFER_SIZE = 1 << 20
+
+# Logs larger than this are parsed in parallel worker processes
+PARALLEL_MIN_SIZE = 4 * 1024 * 1024
 
 
 def create_sample_log(filename):
@@ -28,86 +48,224 @@ def create_sample_log(filename):
     print(f"✅ Sample file '{filename}' created.\n")
 
 
-def parse_log_file(filename):
+def scan_log_lines(lines):
     """
-    Parses firewall log file safely.
-    Returns: (log_entries, errors)
+    Parses and tallies raw (bytes) firewall log lines in a single pass.
+    Returns a partial result that merge_scan_results can combine.
     """
-    log_entries = []
     errors = []
 
-    # ✅ FIX: Auto-create file if missing
-    if not os.path.isfile(filename):
-        create_sample_log(filename)
+    line_count = 0
+    total_entries = 0
+    allow_count = 0
+    deny_count = 0
+
+    denied_ips = set()
+    port_counts = {}
 
-    with open(filename, 'r') as f:
-        lines = f.readlines()
+    # Only the first/last timestamps are reported, so track them
+    # directly instead of keeping every timestamp in a list
+    first_ts = None
+    last_date = None
+    last_time = None
+
+    match = LINE_RE.match
+    denied_ips_add = denied_ips.add
+    port_counts_get = port_counts.get
 
     for line_num, line in enumerate(lines, start=1):
-        if not line.strip():
-            continue
+        line_count = line_num
+        m = match(line)
+
+        if m is not None:
+            date, time, action, source_ip, port = m.groups()
+        else:
+            # Slow path only for lines the pattern rejects
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) < 6:
+                errors.append((line_num, "Not enough fields"))
+                continue
+            try:
+                int(parts[5])
+            except ValueError:
+                errors.append((line_num, "Invalid port"))
+                continue
+            date, time, action, source_ip, _, port = parts[:6]
+
+        total_entries += 1
+
+        if action == b'ALLOW':
+            allow_count += 1
+        elif action == b'DENY':
+            deny_count += 1
+            denied_ips_add(source_ip)
+            port = int(port)
+            port_counts[port] = port_counts_get(port, 0) + 1
 
-        parts = line.strip().split()
+        if first_ts is None:
+            first_ts = date + b' ' + time
+        last_date = date
+        last_time = time
 
-        try:
-            if len(parts) >= 6:
-                entry = {
-                    'date': parts[0],
-                    'time': parts[1],
-                    'action': parts[2],
-                    'source_ip': parts[3],
-                    'dest_ip': parts[4],
-                    'port': int(parts[5])
-                }
-                log_entries.append(entry)
-            else:
-                errors.append(f"Line {line_num}: Not enough fields")
+    return {
+        'line_count': line_count,
+        'total_entries': total_entries,
+        'allow_count': allow_count,
+        'deny_count': deny_count,
+        'denied_ips': denied_ips,
+        'port_counts': port_counts,
+        'first_ts': first_ts,
+        'last_ts': last_date + b' ' + last_time if last_date is not None else None,
+        'errors': errors
+    }
 
-        except ValueError:
-            errors.append(f"Line {line_num}: Invalid port")
 
-    return log_entries, errors
+def read_log_range(f, start, end):
+    """
+    Yields the lines of an open log file from byte `start` up to `end`,
+    reading through the file's buffer instead of loading the range.
+    """
+    f.seek(start)
+    pos = start
 
+    for line in f:
+        if pos >= end:
+            break
+        pos += len(line)
+        yield line
 
-def analyze_logs(log_entries):
-    allow_count = 0
-    deny_count = 0
 
-    denied_ips = set()
-    denied_ports = []
-    timestamps = []
+def scan_log_range(filename, start, end):
+    """
+    Worker: scans the byte range [start, end) of a log file.
+    The range must begin and end on line boundaries.
+    """
+    with open(filename, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        return scan_log_lines(read_log_range(f, start, end))
 
-    for entry in log_entries:
-        if entry['action'] == 'ALLOW':
-            allow_count += 1
-        elif entry['action'] == 'DENY':
-            deny_count += 1
-            denied_ips.add(entry['source_ip'])
-            denied_ports.append(entry['port'])
 
-        timestamps.append(f"{entry['date']} {entry['time']}")
+def merge_scan_results(results):
+    """
+    Combines partial scan results (in file order) into one.
+    Error line numbers are shifted by the lines in earlier chunks.
+    """
+    merged = {
+        'line_count': 0,
+        'total_entries': 0,
+        'allow_count': 0,
+        'deny_count': 0,
+        'denied_ips': set(),
+        'port_counts': {},
+        'first_ts': None,
+        'last_ts': None,
+        'errors': []
+    }
+    port_counts = merged['port_counts']
+
+    for result in results:
+        offset = merged['line_count']
+        merged['errors'].extend(
+            (offset + line_num, message) for line_num, message in result['errors']
+        )
+
+        merged['line_count'] += result['line_count']
+        merged['total_entries'] += result['total_entries']
+        merged['allow_count'] += result['allow_count']
+        merged['deny_count'] += result['deny_count']
+        merged['denied_ips'] |= result['denied_ips']
+
+        for port, count in result['port_counts'].items():
+            port_counts[port] = port_counts.get(port, 0) + count
+
+        # First and last entries in file order, as in the serial scan
+        if merged['first_ts'] is None:
+            merged['first_ts'] = result['first_ts']
+        if result['last_ts'] is not None:
+            merged['last_ts'] = result['last_ts']
+
+    return merged
 
-    port_counter = Counter(denied_ports)
+
+def split_log_file(filename, parts):
+    """
+    Splits a file into up to `parts` byte ranges snapped to newlines.
+    Returns: list of (start, end)
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+
+    with open(filename, 'rb') as f:
+        for i in range(1, parts):
+            target = size * i // parts
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def analyze_log_file(filename):
+    """
+    Parses and analyzes a firewall log file.
+    Large files are split across worker processes, one per CPU.
+    Returns: (analysis, errors)
+    """
+    # ✅ FIX: Auto-create file if missing
+    if not os.path.isfile(filename):
+        create_sample_log(filename)
+
+    workers = os.cpu_count() or 1
+
+    if workers > 1 and os.path.getsize(filename) > PARALLEL_MIN_SIZE:
+        ranges = split_log_file(filename, workers)
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            result = merge_scan_results(pool.map(
+                scan_log_range,
+                [filename] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges]
+            ))
+    else:
+        # Stream the file line by line through a 1 MB read buffer
+        # instead of holding every line in memory with readlines()
+        with open(filename, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            result = scan_log_lines(f)
+
+    port_counts = result['port_counts']
+    first_ts = result['first_ts']
+    last_ts = result['last_ts']
 
     most_port = None
     most_count = 0
 
-    if port_counter:
-        most_port, most_count = port_counter.most_common(1)[0]
+    # Single pass max; most_common(1) would go through heapq
+    if port_counts:
+        most_port, most_count = max(port_counts.items(), key=itemgetter(1))
 
-    return {
-        'total_entries': len(log_entries),
-        'allow_count': allow_count,
-        'deny_count': deny_count,
-        'denied_source_ips': sorted(list(denied_ips)),
+    analysis = {
+        'total_entries': result['total_entries'],
+        'allow_count': result['allow_count'],
+        'deny_count': result['deny_count'],
+        'denied_source_ips': sorted(ip.decode() for ip in result['denied_ips']),
         'most_targeted_port': most_port,
         'most_targeted_count': most_count,
         'time_range': {
-            'first': timestamps[0] if timestamps else "N/A",
-            'last': timestamps[-1] if timestamps else "N/A"
+            'first': first_ts.decode() if first_ts else "N/A",
+            'last': last_ts.decode() if last_ts else "N/A"
         }
     }
 
+    errors = [f"Line {line_num}: {message}" for line_num, message in result['errors']]
+
+    return analysis, errors
+
 
 def save_json_report(analysis, errors):
     report = {
@@ -116,37 +274,45 @@ def save_json_report(analysis, errors):
         "errors": errors
     }
 
-    with open("log_analysis.json", "w") as f:
-        json.dump(report, f, indent=4)
+    if orjson:
+        with open("log_analysis.json", "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open("log_analysis.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
 
 
 def display_summary(analysis):
-    print("=" * 70)
-    print("FIREWALL LOG ANALYSIS SUMMARY")
-    print("=" * 70)
+    # Collect every line and write once; blocked IPs can be a long list
+    lines = [
+        "=" * 70,
+        "FIREWALL LOG ANALYSIS SUMMARY",
+        "=" * 70
+    ]
 
     total = analysis['total_entries']
 
-    print(f"\n📊 Total Entries: {total}")
-    print(f"✅ ALLOW: {analysis['allow_count']}")
-    print(f"🚫 DENY: {analysis['deny_count']}")
+    lines.append(f"\n📊 Total Entries: {total}")
+    lines.append(f"✅ ALLOW: {analysis['allow_count']}")
+    lines.append(f"🚫 DENY: {analysis['deny_count']}")
 
     if total > 0:
         deny_pct = (analysis['deny_count'] / total) * 100
-        print(f"   ({deny_pct:.1f}% denied)")
+        lines.append(f"   ({deny_pct:.1f}% denied)")
 
-    print("\n🔒 Blocked IPs:")
-    for ip in analysis['denied_source_ips']:
-        print(f" - {ip}")
+    lines.append("\n🔒 Blocked IPs:")
+    lines.extend(f" - {ip}" for ip in analysis['denied_source_ips'])
 
     if analysis['most_targeted_port']:
-        print(f"\n🎯 Most targeted port: {analysis['most_targeted_port']}")
-        print(f"   Attacks: {analysis['most_targeted_count']}")
+        lines.append(f"\n🎯 Most targeted port: {analysis['most_targeted_port']}")
+        lines.append(f"   Attacks: {analysis['most_targeted_count']}")
+
+    lines.append("\n⏰ Time range:")
+    lines.append(f" First: {analysis['time_range']['first']}")
+    lines.append(f" Last:  {analysis['time_range']['last']}")
+    lines.append("=" * 70)
 
-    print("\n⏰ Time range:")
-    print(f" First: {analysis['time_range']['first']}")
-    print(f" Last:  {analysis['time_range']['last']}")
-    print("=" * 70)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ================= MAIN =================
@@ -161,11 +327,9 @@ if __name__ == "__main__":
 
     print(f"📖 Reading: {filename}")
 
-    log_entries, errors = parse_log_file(filename)
-
-    print(f"✓ Loaded {len(log_entries)} entries\n")
+    analysis, errors = analyze_log_file(filename)
 
-    analysis = analyze_logs(log_entries)
+    print(f"✓ Loaded {analysis['total_entries']} entries\n")
 
     display_summary(analysis)
 
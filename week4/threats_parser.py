@@ -1,26 +1,35 @@
 #!/usr/bin/env python3
 # threat_parser.py
 
+import io
 import json
 from datetime import datetime
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Script directory, resolved once at import
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Severities always shown in the report, in display order
+SEVERITY_ORDER = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
 
 def load_threat_data(filename):
     """
     Loads threat intelligence data from JSON file.
     """
 
-    # Get script directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-
     # If user provided full path, use it
     if os.path.isabs(filename):
         filepath = filename
     else:
         # Try file in script directory
-        filepath = os.path.join(script_dir, filename)
+        filepath = os.path.join(_SCRIPT_DIR, filename)
 
     # Check if file exists
     if not os.path.exists(filepath):
@@ -35,14 +44,15 @@ def load_threat_data(filename):
         print("   python threat_parser.py C:\\full\\path\\to\\threats.json")
 
         print("\nCurrent script location:")
-        print(script_dir)
+        print(_SCRIPT_DIR)
 
         print("=" * 70)
         sys.exit(1)
 
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     except json.JSONDecodeError:
         print("ERROR: Invalid JSON format.")
         sys.exit(1)
@@ -51,30 +61,30 @@ def load_threat_data(filename):
 def analyze_threats(threat_data):
     threats = threat_data.get('threats', [])
 
-    severity_counts = {
-        'CRITICAL': 0,
-        'HIGH': 0,
-        'MEDIUM': 0,
-        'LOW': 0
-    }
+    severity_counts = dict.fromkeys(SEVERITY_ORDER, 0)
 
-    all_ips = []
+    # Dedup as we go; only the occurrence count is needed for the total
+    all_ips = set()
+    ip_occurrences = 0
     active_exploits = []
 
+    severity_counts_get = severity_counts.get
+    all_ips_update = all_ips.update
+    active_exploits_append = active_exploits.append
+
     for threat in threats:
         severity = threat.get('severity', 'LOW').upper()
 
-        if severity not in severity_counts:
-            severity_counts[severity] = 0
-
-        severity_counts[severity] += 1
+        # One lookup handles both known and unexpected severities
+        severity_counts[severity] = severity_counts_get(severity, 0) + 1
 
         ips = threat.get('indicators', {}).get('ips', [])
         if isinstance(ips, list):
-            all_ips.extend(ips)
+            all_ips_update(ips)
+            ip_occurrences += len(ips)
 
         if threat.get('active_exploit', False):
-            active_exploits.append({
+            active_exploits_append({
                 'id': threat.get('id', 'UNKNOWN'),
                 'type': threat.get('type', 'unknown'),
                 'description': threat.get('description', 'No description')
@@ -90,76 +100,82 @@ def analyze_threats(threat_data):
     return {
         'total_threats': total_threats,
         'severity_counts': severity_counts,
-        'unique_ips': list(set(all_ips)),
-        'total_ips': len(all_ips),
+        'unique_ips': list(all_ips),
+        'total_ips': ip_occurrences,
         'active_exploits': active_exploits,
         'critical_percentage': critical_percentage
     }
 
 
 def generate_report(threat_data, analysis, output_file):
-    report_lines = []
-
-    report_lines.append("=" * 70)
-    report_lines.append("THREAT INTELLIGENCE ANALYSIS REPORT")
-    report_lines.append("=" * 70)
-    report_lines.append(f"Feed: {threat_data.get('feed_name', 'Unknown')}")
-    report_lines.append(f"Date: {threat_data.get('date', 'Unknown')}")
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append("")
-
-    report_lines.append("-" * 70)
-    report_lines.append("SUMMARY STATISTICS")
-    report_lines.append("-" * 70)
-    report_lines.append(f"Total Threats: {analysis['total_threats']}")
-    report_lines.append(f"Total Malicious IPs: {analysis['total_ips']}")
-    report_lines.append(f"Unique IPs: {len(analysis['unique_ips'])}")
-    report_lines.append(f"Active Exploits: {len(analysis['active_exploits'])}")
-    report_lines.append("")
-
-    report_lines.append("-" * 70)
-    report_lines.append("SEVERITY BREAKDOWN")
-    report_lines.append("-" * 70)
+    # Write straight into one buffer instead of collecting a list of lines
+    buf = io.StringIO()
+    write = buf.write
+
+    double_rule = "=" * 70 + "\n"
+    single_rule = "-" * 70 + "\n"
+
+    write(double_rule)
+    write("THREAT INTELLIGENCE ANALYSIS REPORT\n")
+    write(double_rule)
+    write(f"Feed: {threat_data.get('feed_name', 'Unknown')}\n")
+    write(f"Date: {threat_data.get('date', 'Unknown')}\n")
+    write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    write("\n")
+
+    write(single_rule)
+    write("SUMMARY STATISTICS\n")
+    write(single_rule)
+    write(f"Total Threats: {analysis['total_threats']}\n")
+    write(f"Total Malicious IPs: {analysis['total_ips']}\n")
+    write(f"Unique IPs: {len(analysis['unique_ips'])}\n")
+    write(f"Active Exploits: {len(analysis['active_exploits'])}\n")
+    write("\n")
+
+    write(single_rule)
+    write("SEVERITY BREAKDOWN\n")
+    write(single_rule)
 
     total = analysis['total_threats']
     for severity, count in analysis['severity_counts'].items():
         percent = (count / total * 100) if total > 0 else 0
-        report_lines.append(f"{severity:10}: {count} threats ({percent:.1f}%)")
+        write(f"{severity:10}: {count} threats ({percent:.1f}%)\n")
 
-    report_lines.append("")
+    write("\n")
 
-    report_lines.append("-" * 70)
-    report_lines.append("MALICIOUS IP ADDRESSES")
-    report_lines.append("-" * 70)
+    write(single_rule)
+    write("MALICIOUS IP ADDRESSES\n")
+    write(single_rule)
     for ip in sorted(analysis['unique_ips']):
-        report_lines.append(f"  - {ip}")
+        write(f"  - {ip}\n")
 
-    report_lines.append("")
+    write("\n")
 
-    report_lines.append("-" * 70)
-    report_lines.append("ACTIVE EXPLOITS")
-    report_lines.append("-" * 70)
+    write(single_rule)
+    write("ACTIVE EXPLOITS\n")
+    write(single_rule)
 
     if analysis['active_exploits']:
         for exploit in analysis['active_exploits']:
-            report_lines.append(f"\n{exploit['id']} ({exploit['type'].upper()})")
-            report_lines.append(f"  Description: {exploit['description']}")
+            write(f"\n{exploit['id']} ({exploit['type'].upper()})\n")
+            write(f"  Description: {exploit['description']}\n")
     else:
-        report_lines.append("None found.")
+        write("None found.\n")
+
+    write("\n")
+    write(double_rule)
+    write("END OF REPORT\n")
+    write("=" * 70)
 
-    report_lines.append("")
-    report_lines.append("=" * 70)
-    report_lines.append("END OF REPORT")
-    report_lines.append("=" * 70)
+    report = buf.getvalue()
 
     # Save in script directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(script_dir, output_file)
+    output_path = os.path.join(_SCRIPT_DIR, output_file)
 
     with open(output_path, 'w') as f:
-        f.write('\n'.join(report_lines))
+        f.write(report)
 
-    return report_lines, output_path
+    return report, output_path
 
 
 def main():
@@ -178,7 +194,7 @@ def main():
 
     analysis = analyze_threats(threat_data)
 
-    report_lines, output_path = generate_report(
+    report, output_path = generate_report(
         threat_data,
         analysis,
         'threat_report.txt'
@@ -188,8 +204,8 @@ def main():
 
     print("\nPreview:")
     print("=" * 70)
-    for line in report_lines[:20]:  # show first 20 lines
-        print(line)
+    # show first 20 lines
+    sys.stdout.write('\n'.join(report.split('\n', 20)[:20]) + '\n')
 
 
 if __name__ == "__main__":
@@ -18,6 +18,13 @@ CATEGORY_MAP = {
 
 DEFAULT_CATEGORY = "other"
 
+# Inverse lookup: extension -> category (one dict probe per file)
+EXT_TO_CATEGORY = {
+    ext: cat
+    for cat, exts in CATEGORY_MAP.items()
+    for ext in exts
+}
+
 
 # -------------------------
 # GET EXTENSION
@@ -38,13 +45,7 @@ def get_extension(filename):
 # GET CATEGORY
 # -------------------------
 def get_category(filename):
-    ext = get_extension(filename)
-
-    for cat, exts in CATEGORY_MAP.items():
-        if ext in exts:
-            return cat
-
-    return DEFAULT_CATEGORY
+    return EXT_TO_CATEGORY.get(get_extension(filename), DEFAULT_CATEGORY)
 
 
 # -------------------------
@@ -69,26 +70,43 @@ def organize(source_folder):
 
     moved = 0
 
-    for filename in os.listdir(source_folder):
+    # Category folders already created in NEW folder (one makedirs each)
+    category_paths = {}
+
+    # Snapshot the listing before moving anything; changing a directory
+    # while scandir is still reading it can skip entries
+    with os.scandir(source_folder) as it:
+        entries = list(it)
 
-        src = os.path.join(source_folder, filename)
+    for entry in entries:
 
-        # Skip directories
-        if os.path.isdir(src):
+        # Skip directories (DirEntry caches the type, no extra stat)
+        if entry.is_dir():
             continue
 
+        filename = entry.name
+        src = entry.path
+
         category = get_category(filename)
 
         # Create category folder in NEW folder
-        category_path = os.path.join(new_folder, category)
-        os.makedirs(category_path, exist_ok=True)
+        category_path = category_paths.get(category)
+        if category_path is None:
+            category_path = os.path.join(new_folder, category)
+            os.makedirs(category_path, exist_ok=True)
+            category_paths[category] = category_path
 
         dest = os.path.join(category_path, filename)
 
         print(f"Moving: {filename} -> {category}")
 
         try:
-            shutil.move(src, dest)
+            # Same filesystem is the common case: a single rename.
+            # shutil.move handles cross-device copies and the rest.
+            try:
+                os.rename(src, dest)
+            except OSError:
+                shutil.move(src, dest)
             moved += 1
         except Exception as e:
             print(f"ERROR: {e}")
@@ -1,76 +1,123 @@
 #!/usr/bin/env python3
 # security_log_analyzer.py
 
+import argparse
 from collections import Counter
-from datetime import datetime
+from datetime import datetime, timezone
+from heapq import nlargest
 import json
+from operator import itemgetter
+import mmap
+import os
 import sys
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# -------------------------
-# Parse a single log line
-# -------------------------
-def parse_log_line(line):
-    if not line or not line.strip():
-        return None
-
-    parts = line.split()
-
-    if len(parts) < 3:
-        return None
+# Logs are scanned as raw bytes; only the few keys that end up in the
+# reports are decoded to str.
 
-    date_part = parts[0]
-    time_part = parts[1]
+# Leading "date time" of a log line followed by at least one more field;
+# a line only counts as parsed if this matches
+_HEAD = re.compile(rb"\s*(\S*-\S*)\s+(\S*:\S*)\s+(?=\S)")
 
-    if "-" not in date_part or ":" not in time_part:
-        return None
+# The only fields process_logs needs from a failure line
+_FAIL_FIELDS = re.compile(rb"(?<!\S)(status|user|ip)=(\S+)")
 
-    result = {"timestamp": f"{date_part} {time_part}"}
+_UTC = timezone.utc
 
-    for item in parts[2:]:
-        if "=" not in item:
-            continue
+# Report separators
+RULE = "=" * 70
+TABLE_RULE = "-" * 30
 
-        key, value = item.split("=", 1)
+# Bytes scanned per block when processing a log file
+BLOCK_SIZE = 1 << 20
 
-        if key and value:
-            result[key] = value
-
-    return result
+# Logs larger than this are counted in parallel worker processes
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
 
 
 # -------------------------
 # Process logs
 # -------------------------
-def process_logs(log_lines):
+def iter_blocks(data, start=0, end=None):
+    # Slices of whole lines, each ending just after a newline
+    size = len(data) if end is None else end
+
+    while start < size:
+        stop = data.find(b"\n", start + BLOCK_SIZE, size)
+        stop = size if stop == -1 else stop + 1
+
+        yield data[start:stop]
+        start = stop
+
+
+def process_logs(log_data, start=0, end=None):
+    # Filled a block at a time through Counter.update(), which counts a
+    # list in C instead of one Python-level increment per failure
     user_counts = Counter()
     ip_counts = Counter()
 
     total_lines = 0
     parsed_lines = 0
     fail_count = 0
+    ends_with_newline = True
 
-    for line in log_lines:
-        total_lines += 1
+    match_head = _HEAD.match
+    find_fail_fields = _FAIL_FIELDS.findall
+
+    for block in iter_blocks(log_data, start, end):
+        total_lines += block.count(b"\n")
+        ends_with_newline = block.endswith(b"\n")
+
+        users = []
+        ips = []
+        add_user = users.append
+        add_ip = ips.append
+
+        for line in block.split(b"\n"):
+            # Most lines are not failures: only validate their header and
+            # leave the field parse to lines that could be a FAIL
+            if b"status=FAIL" not in line:
+                if match_head(line):
+                    parsed_lines += 1
+                continue
+
+            head = match_head(line)
+            if head is None:
+                continue
 
-        parsed = parse_log_line(line)
-        if parsed is None:
-            continue
+            parsed_lines += 1
 
-        parsed_lines += 1
+            # Only status/user/ip are pulled out; other fields on the
+            # line are never copied into their own bytes objects
+            fields = dict(find_fail_fields(line, head.end()))
+
+            if fields.get(b"status") != b"FAIL":
+                continue
 
-        if parsed.get("status") == "FAIL":
             fail_count += 1
 
-            user = parsed.get("user")
-            ip = parsed.get("ip")
+            user = fields.get(b"user")
+            ip = fields.get(b"ip")
 
             if user:
-                user_counts[user] += 1
+                add_user(user)
 
             if ip:
-                ip_counts[ip] += 1
+                add_ip(ip)
+
+        user_counts.update(users)
+        ip_counts.update(ips)
+
+    # A last line without a trailing newline still counts
+    if not ends_with_newline:
+        total_lines += 1
 
     return {
         "total_lines": total_lines,
@@ -81,10 +128,95 @@ def process_logs(log_lines):
     }
 
 
+# -------------------------
+# Parallel processing
+# -------------------------
+def split_ranges(log_data, parts):
+    # Byte ranges of roughly equal size, each ending after a newline
+    size = len(log_data)
+    ranges = []
+    start = 0
+
+    for i in range(1, parts):
+        end = log_data.find(b"\n", max(start, size * i // parts))
+        if end == -1:
+            break
+        ranges.append((start, end + 1))
+        start = end + 1
+
+    if start < size:
+        ranges.append((start, size))
+
+    return ranges
+
+
+def process_log_range(path, start, end):
+    # Worker: maps the file itself and counts one byte range. Counts
+    # go back as plain dicts, which pickle smaller.
+    stats = process_logs(map_log_file(path), start, end)
+    stats["user_counts"] = dict(stats["user_counts"])
+    stats["ip_counts"] = dict(stats["ip_counts"])
+    return stats
+
+
+def process_log_file(path, log_data):
+    workers = os.cpu_count() or 1
+
+    if workers < 2 or len(log_data) < PARALLEL_MIN_SIZE:
+        return process_logs(log_data)
+
+    ranges = split_ranges(log_data, workers)
+
+    stats = {
+        "total_lines": 0,
+        "parsed_lines": 0,
+        "fail_count": 0,
+        "user_counts": Counter(),
+        "ip_counts": Counter()
+    }
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        # map() yields in file order, so ties keep first-seen order
+        for part in pool.map(
+            process_log_range,
+            [path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges]
+        ):
+            stats["total_lines"] += part["total_lines"]
+            stats["parsed_lines"] += part["parsed_lines"]
+            stats["fail_count"] += part["fail_count"]
+            stats["user_counts"].update(part["user_counts"])
+            stats["ip_counts"].update(part["ip_counts"])
+
+    return stats
+
+
+# -------------------------
+# Report timestamp
+# -------------------------
+def utc_timestamp():
+    return datetime.now(_UTC).isoformat(timespec="seconds")
+
+
+# -------------------------
+# Top counted keys
+# -------------------------
+def top_counts(counts, n=5):
+    # Keys are raw bytes from the log; decode only the ones reported
+    return [
+        (key.decode("utf-8", errors="replace"), count)
+        for key, count in nlargest(n, counts.items(), key=itemgetter(1))
+    ]
+
+
 # -------------------------
 # Build JSON data
 # -------------------------
-def build_report_data(stats, analyst_name="Analyst"):
+def build_report_data(stats, analyst_name="Analyst", generated_at=None):
+    if generated_at is None:
+        generated_at = utc_timestamp()
+
     total = stats["parsed_lines"]
     fails = stats["fail_count"]
 
@@ -92,7 +224,7 @@ def build_report_data(stats, analyst_name="Analyst"):
 
     return {
         "metadata": {
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": generated_at,
             "analyst": analyst_name
         },
         "summary": {
@@ -103,11 +235,11 @@ def build_report_data(stats, analyst_name="Analyst"):
         },
         "top_users": [
             {"user": u, "fail_count": c}
-            for u, c in stats["user_counts"].most_common(5)
+            for u, c in top_counts(stats["user_counts"])
         ],
         "top_ips": [
             {"ip": ip, "fail_count": c}
-            for ip, c in stats["ip_counts"].most_common(5)
+            for ip, c in top_counts(stats["ip_counts"])
         ]
     }
 
@@ -115,56 +247,75 @@ def build_report_data(stats, analyst_name="Analyst"):
 # -------------------------
 # Human report
 # -------------------------
-def generate_human_report(stats, analyst_name="Analyst"):
+def generate_human_report(stats, analyst_name="Analyst", generated_at=None):
+    if generated_at is None:
+        generated_at = utc_timestamp()
+
     total_logs = stats["total_lines"]
     parsed_logs = stats["parsed_lines"]
     fail_count = stats["fail_count"]
 
     failure_rate = (fail_count / parsed_logs * 100) if parsed_logs > 0 else 0
 
-    line = "=" * 70
-    report = []
-
-    report.append(line)
-    report.append("SECURITY LOG ANALYSIS REPORT")
-    report.append(line)
-
-    report.append("METADATA")
-    report.append(line)
-    report.append(f"Analyst:           {analyst_name}")
-    report.append(f"Generated At:      {datetime.utcnow().isoformat()}")
-    report.append("")
-
-    report.append("SUMMARY")
-    report.append(line)
-    report.append(f"Total Logs:        {total_logs:,}")
-    report.append(f"Parsed Logs:       {parsed_logs:,}")
-    report.append(f"Failed Logins:     {fail_count:,}")
-    report.append(f"Failure Rate:      {failure_rate:.1f}%")
-    report.append("")
-
-    report.append("TOP TARGETED USERS")
-    report.append(line)
-    report.append(f"{'User':20} {'Failures':>10}")
-    report.append("-" * 30)
+    # One row per entry, each ending in a newline (empty if no failures)
+    top_users_block = "".join(
+        f"{user:20} {count:>10,}\n"
+        for user, count in top_counts(stats["user_counts"])
+    )
+    top_ips_block = "".join(
+        f"{ip:20} {count:>10,}\n"
+        for ip, count in top_counts(stats["ip_counts"])
+    )
+
+    return f"""{RULE}
+SECURITY LOG ANALYSIS REPORT
+{RULE}
+METADATA
+{RULE}
+Analyst:           {analyst_name}
+Generated At:      {generated_at}
+
+SUMMARY
+{RULE}
+Total Logs:        {total_logs:,}
+Parsed Logs:       {parsed_logs:,}
+Failed Logins:     {fail_count:,}
+Failure Rate:      {failure_rate:.1f}%
+
+TOP TARGETED USERS
+{RULE}
+{'User':20} {'Failures':>10}
+{TABLE_RULE}
+{top_users_block}
+TOP ATTACKING IPS
+{RULE}
+{'IP Address':20} {'Failures':>10}
+{TABLE_RULE}
+{top_ips_block}
+{RULE}"""
 
-    for user, count in stats["user_counts"].most_common(5):
-        report.append(f"{user:20} {count:>10,}")
 
-    report.append("")
+# -------------------------
+# Map log file into memory
+# -------------------------
+def map_log_file(path):
+    with open(path, "rb") as f:
+        # mmap cannot map an empty file
+        if f.seek(0, 2) == 0:
+            return b""
 
-    report.append("TOP ATTACKING IPS")
-    report.append(line)
-    report.append(f"{'IP Address':20} {'Failures':>10}")
-    report.append("-" * 30)
+        # The log is read front to back once: ask the kernel for
+        # aggressive read-ahead (not available on Windows)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
 
-    for ip, count in stats["ip_counts"].most_common(5):
-        report.append(f"{ip:20} {count:>10,}")
+        # The mapping stays valid after the file object is closed
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-    report.append("")
-    report.append(line)
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
 
-    return "\n".join(report)
+    return mm
 
 
 # -------------------------
@@ -176,12 +327,7 @@ def load_log_file(file_path):
     if not path.exists():
         return None, path
 
-    lines = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            lines.append(line.strip())
-
-    return lines, path
+    return map_log_file(path), path
 
 
 # -------------------------
@@ -191,17 +337,40 @@ if __name__ == "__main__":
     analyst_name = "Tanya"
 
     # 1. Get file path from command line OR default
-    if len(sys.argv) > 1:
-        log_file = sys.argv[1]
-    else:
+    parser = argparse.ArgumentParser(description="Scan an auth log for failed logins")
+    parser.add_argument(
+        "log_file",
+        nargs="?",
         # Default to script directory
-        script_dir = Path(__file__).parent
-        log_file = script_dir / "auth_test.log"
+        default=Path(__file__).parent / "auth_test.log",
+        help="log file to scan (default: auth_test.log next to this script)"
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="indent the JSON report (compact by default)"
+    )
+    parser.add_argument(
+        "--no-text",
+        action="store_true",
+        help="skip incident_report.txt"
+    )
+    parser.add_argument(
+        "--no-json",
+        action="store_true",
+        help="skip incident_report.json"
+    )
+    args = parser.parse_args()
+
+    if args.no_json and args.no_text:
+        parser.error("--no-json and --no-text together leave nothing to do")
+
+    log_file = args.log_file
 
     # 2. Load file
-    log_lines, path = load_log_file(log_file)
+    log_data, path = load_log_file(log_file)
 
-    if log_lines is None:
+    if log_data is None:
         print(f"❌ Error: Log file not found at:\n{path}")
         print("\n✔ Fix options:")
         print("1. Put auth_test.log in the same folder as the script")
@@ -212,24 +381,42 @@ if __name__ == "__main__":
     print(f"✔ Loaded log file: {path}")
 
     # 3. Process logs
-    stats = process_logs(log_lines)
-
-    # 4. Build reports
-    report_data = build_report_data(stats, analyst_name)
-    text_report = generate_human_report(stats, analyst_name)
+    stats = process_log_file(path, log_data)
 
-    # 5. Save reports
+    # 4. Build and save only the requested reports
+    generated_at = utc_timestamp()
     output_dir = Path(path).parent
+    written = []
+
+    if not args.no_json:
+        report_data = build_report_data(stats, analyst_name, generated_at)
+        json_file = output_dir / "incident_report.json"
+
+        if orjson:
+            option = orjson.OPT_INDENT_2 if args.pretty else 0
+            json_file.write_bytes(orjson.dumps(report_data, option=option))
+        elif args.pretty:
+            json_file.write_text(
+                json.dumps(report_data, indent=2, ensure_ascii=False),
+                encoding="utf-8"
+            )
+        else:
+            # Compact output stays on the C encoder's fast path
+            json_file.write_text(
+                json.dumps(report_data, separators=(",", ":"), ensure_ascii=False),
+                encoding="utf-8"
+            )
+
+        written.append(json_file)
 
-    json_file = output_dir / "incident_report.json"
-    txt_file = output_dir / "incident_report.txt"
+    if not args.no_text:
+        text_report = generate_human_report(stats, analyst_name, generated_at)
+        txt_file = output_dir / "incident_report.txt"
 
-    with open(json_file, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, indent=2)
+        txt_file.write_text(text_report, encoding="utf-8")
 
-    with open(txt_file, "w", encoding="utf-8") as f:
-        f.write(text_report)
+        written.append(txt_file)
 
     print("\n✅ Reports generated:")
-    print(f" - {json_file}")
-    print(f" - {txt_file}")
\ No newline at end of file
+    for report_file in written:
+        print(f" - {report_file}")
\ No newline at end of file